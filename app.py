@@ -1,8 +1,26 @@
 import streamlit as st
 import streamlit.components.v1 as components
+import numpy as np
 import base64
+import bisect
+import csv
+import hashlib
+import io
+import multiprocessing
 import os
+import re
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from exit_math import (
+    EXIT_MODELS,
+    chunked,
+    linear_value,
+    make_exit,
+    replay_history,
+    worker_main,
+)
 
 BASELINE_FDV = 80000000
 
@@ -29,6 +47,44 @@ COMPARABLE_PROTOCOLS = [
     ("Aevo", "$100M"),
 ]
 
+# goal multiples shown in the "what you need" card (0 = break-even)
+GOAL_LADDER = (0.0, 0.5, 1.0, 2.0)
+
+# search grid for the numeric inverse solver: 0 plus 1 .. 1e15, 8 steps per decade
+SOLVER_GRID = np.concatenate([[0.0], np.logspace(0, 15, 121)])
+
+DEFAULT_SCENARIOS = [50000000, 200000000, 500000000, 1000000000, 2000000000, 5000000000, 10000000000]
+LADDER_SOURCES = ["Default", "Range — linear steps", "Range — log steps", "Imported list"]
+MAX_LADDER_ROWS = 100000
+TABLE_PAGE_SIZE = 25
+FDV_SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+# one FDV per match: a plain-digit number with 3-digit comma groups (2,000,000),
+# otherwise anything between commas, semicolons and whitespace (300M, $1.5B)
+FDV_LIST_TOKEN = re.compile(r"\$?\d{1,3}(?:,\d{3})+(?=[,;\s]|$)|[^,;\s]+")
+
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), "histories")
+BACKTEST_WEEKLY_PCTS = (10, 25, 50)
+BACKTEST_STOP_PCTS = (10, 20, 30, 50)
+# below this many histories, replaying in-process beats shipping work to workers
+BACKTEST_POOL_MIN_HISTORIES = 64
+
+# share-card verdicts as (css class, label), best first
+BADGES = (("ok", "GOAL HIT"), ("ok", "PROFIT"), ("no", "REKT"), ("no", "NO DATA"))
+
+# leaderboard sketches: signed log buckets with ~1% relative error on |net| in $1 .. $10T
+SKETCH_GAMMA = 1.02
+SKETCH_BINS = int(np.ceil(np.log(1e13) / np.log(SKETCH_GAMMA)))
+SKETCH_VALUES = np.concatenate([
+    -SKETCH_GAMMA ** (np.arange(SKETCH_BINS)[::-1] + 0.5),
+    [0.0],
+    SKETCH_GAMMA ** (np.arange(SKETCH_BINS) + 0.5),
+])
+LEADERBOARD_CHUNK_ROWS = 50000
+LEADERBOARD_PATH = os.path.join(os.path.dirname(__file__), "leaderboard.csv")
+DIST_EDGES = (-1e6, -1e5, -1e4, -1e3, 0, 1e3, 1e4, 1e5, 1e6)
+
+ALLOC_MODELS = ["1 point = 1 token", "Pro-rata", "Tiered"]
+DEFAULT_TIERS = "0:1, 100000:1.1, 1000000:1.2"
 
 def fmt(value: float, short: bool = False) -> str:
     sign = "-" if value < 0 else ""
@@ -68,6 +124,487 @@ def fmt_card(value: float) -> str:
     return f"{sign}${v:.4f}"
 
 
+def fmt_need(value: float) -> str:
+    """Like fmt, but for inverse answers that may be out of reach."""
+    return fmt(value) if np.isfinite(value) else "Out of reach"
+
+
+def fmt_pts(value: float) -> str:
+    return f"{value:,.0f}" if np.isfinite(value) else "Out of reach"
+
+
+@st.cache_data
+def load_book(raw: bytes) -> tuple:
+    """Parse `discount_pct,depth_usd` rows (header optional) into sorted levels."""
+    levels = []
+    for line in csv.reader(io.StringIO(raw.decode("utf-8", errors="ignore"))):
+        try:
+            levels.append((float(line[0]) / 100, float(line[1])))
+        except (ValueError, IndexError):
+            continue
+    levels = sorted(lv for lv in levels if 0 <= lv[0] < 1 and lv[1] > 0)
+    return tuple(d for d, _ in levels), tuple(u for _, u in levels)
+
+
+def solve_increasing(fn, target, grid=SOLVER_GRID, iters: int = 50):
+    """Smallest x >= 0 with fn(x) >= target, elementwise over `target`.
+
+    Brackets the first crossing on `grid`, then refines every element at
+    once with bisection. Elements that never cross come back as inf.
+    """
+    target = np.asarray(target, dtype=float)
+    lo = np.zeros(target.shape)
+    hi = np.full(target.shape, np.inf)
+    prev = 0.0
+    for x in grid:
+        hit = np.isinf(hi) & (fn(np.full(target.shape, x)) >= target)
+        lo = np.where(hit, prev, lo)
+        hi = np.where(hit, x, hi)
+        prev = x
+    found = np.isfinite(hi)
+    hi = np.where(found, hi, lo)
+    for _ in range(iters):
+        mid = (lo + hi) / 2
+        below = fn(mid) < target
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return np.where(found, hi, np.inf)
+
+
+def solve_needs(points, avg_cost, supply, goals, fdvs, value_fn=None):
+    """Batch inverse queries for W wallets, G goals and F FDVs.
+
+    Returns a dict of arrays:
+      required_fdv (W, G) — FDV at which net profit reaches each goal
+      max_cost     (W, F) — highest avg cost per point that still breaks even
+      min_points   (W, G, F) — fewest points at the wallet's avg cost to hit each goal
+
+    With the default paper value everything is closed-form. A nonlinear
+    `value_fn(points, price)` (fees, vesting, slippage) goes through
+    solve_increasing instead.
+    """
+    points = np.atleast_1d(np.asarray(points, dtype=float))[:, None]
+    avg_cost = np.atleast_1d(np.asarray(avg_cost, dtype=float))[:, None]
+    supply = np.atleast_1d(np.asarray(supply, dtype=float))[:, None]
+    goals = np.asarray(goals, dtype=float)
+    goals = goals if goals.ndim == 2 else np.atleast_1d(goals)[None, :]
+    fdvs = np.atleast_1d(np.asarray(fdvs, dtype=float))[None, :]
+    price = fdvs / supply
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spent = np.nan_to_num(points * avg_cost)
+        if value_fn is None:
+            required_fdv = np.where(points > 0, (goals + spent) / points * supply, np.inf)
+            max_cost = np.broadcast_to(price, np.broadcast_shapes(points.shape, price.shape))
+            edge = (price - avg_cost)[:, None, :]
+            g = goals[:, :, None]
+            min_points = np.where(g <= 0, 0.0, np.where(edge > 0, g / edge, np.inf))
+            return {"required_fdv": required_fdv, "max_cost": max_cost, "min_points": min_points}
+
+        p_wg, spent_wg, supply_wg, goals_wg = np.broadcast_arrays(points, spent, supply, goals)
+        required_fdv = solve_increasing(
+            lambda f: value_fn(p_wg, f / supply_wg) - spent_wg, goals_wg
+        )
+        required_fdv = np.where(p_wg > 0, required_fdv, np.inf)
+
+        max_cost = np.where(points > 0, value_fn(points, price) / points, price)
+
+        price_wgf, cost_wgf, goals_wgf = np.broadcast_arrays(
+            price[:, None, :], avg_cost[:, None, :], goals[:, :, None]
+        )
+        min_points = solve_increasing(
+            lambda q: value_fn(q, price_wgf) - q * cost_wgf, goals_wgf
+        )
+    return {"required_fdv": required_fdv, "max_cost": max_cost, "min_points": min_points}
+
+
+def parse_fdv(text: str) -> float:
+    """Parse '300M', '$1.5B', '2,000,000' and friends into dollars."""
+    t = text.strip().upper().replace("$", "").replace(",", "").replace("_", "")
+    mult = FDV_SUFFIXES.get(t[-1:], 1.0)
+    if mult != 1.0:
+        t = t[:-1]
+    return float(t) * mult
+
+
+@st.cache_data
+def fdv_ladder(source: str, start: float, stop: float, steps: int, raw: str) -> tuple:
+    """Build a sorted, de-duplicated FDV ladder of at most MAX_LADDER_ROWS values.
+
+    Returns (ladder, distinct values before the cut). An imported list with
+    nothing parseable comes back empty.
+    """
+    if source == "Range — linear steps":
+        ladder = np.linspace(start, stop, max(steps, 2))
+    elif source == "Range — log steps":
+        ladder = np.geomspace(start, stop, max(steps, 2))
+    elif source == "Imported list":
+        values = []
+        for tok in FDV_LIST_TOKEN.findall(raw):
+            try:
+                values.append(parse_fdv(tok))
+            except ValueError:
+                continue
+        ladder = np.array(values, dtype=float)
+    else:
+        ladder = np.array(DEFAULT_SCENARIOS, dtype=float)
+    ladder = np.unique(ladder[np.isfinite(ladder) & (ladder > 0)])
+    return ladder[:MAX_LADDER_ROWS], ladder.size
+
+
+def load_history(raw: bytes) -> np.ndarray:
+    """Price series from a CSV: the last numeric cell of each row, oldest first."""
+    prices = []
+    for line in csv.reader(io.StringIO(raw.decode("utf-8", errors="ignore"))):
+        for cell in reversed(line):
+            try:
+                prices.append(float(cell))
+                break
+            except ValueError:
+                continue
+    series = np.array(prices, dtype=float)
+    return series[np.isfinite(series) & (series > 0)]
+
+
+@st.cache_data
+def local_histories(files: tuple) -> dict:
+    """Load (path, mtime) pairs from HISTORY_DIR; mtime is only there to bust the cache."""
+    histories = {}
+    for path, _ in files:
+        with open(path, "rb") as f:
+            series = load_history(f.read())
+        if series.size >= 2:
+            histories[os.path.splitext(os.path.basename(path))[0]] = series
+    return histories
+
+
+def backtest_strategies(weekly_pcts, stop_pcts) -> tuple:
+    """(label, kind, param) for every strategy x parameter set."""
+    return (
+        (("Dump at TGE", "dump", 0.0),)
+        + tuple((f"Sell {w}% / week", "weekly", w / 100) for w in weekly_pcts)
+        + tuple((f"Trailing stop {x}%", "trail", x / 100) for x in stop_pcts)
+    )
+
+
+@st.cache_resource
+def backtest_pool() -> ProcessPoolExecutor:
+    """One long-lived spawn pool shared by every session; forking Streamlit's threaded server is unsafe."""
+    return ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+
+
+@st.cache_data
+def run_backtest(
+    histories: dict,
+    listing_price: float,
+    horizon: int,
+    strategies: tuple,
+    points: float,
+    exit_cfg: tuple,
+) -> np.ndarray:
+    """Proceeds for each history x strategy, shape (H, S).
+
+    Large batches of histories are replayed on backtest_pool; smaller
+    ones in-process.
+    """
+    replay = partial(
+        replay_history,
+        listing_price=listing_price,
+        horizon=horizon,
+        strategies=strategies,
+        points=points,
+        exit_cfg=exit_cfg,
+    )
+    if len(histories) >= BACKTEST_POOL_MIN_HISTORIES:
+        chunksize = -(-len(histories) // (os.cpu_count() or 1))
+        with worker_main():
+            results = backtest_pool().map(replay, histories.values(), chunksize=chunksize)
+        proceeds = list(results)
+    else:
+        proceeds = [replay(series) for series in histories.values()]
+    return np.array(proceeds).reshape(len(histories), len(strategies))
+
+
+def badge_index(points, net, goal):
+    """Index into BADGES for each wallet — the share card's verdict, vectorized."""
+    points, net, goal = np.broadcast_arrays(points, net, goal)
+    has = points > 0
+    return np.select([has & (net >= goal), has & (net >= 0), has], [0, 1, 2], 3)
+
+
+def empty_sketch(n_fdv: int) -> dict:
+    return {
+        "n": 0,
+        "badges": np.zeros((n_fdv, len(BADGES)), dtype=np.int64),
+        "buckets": np.zeros((n_fdv, SKETCH_VALUES.size), dtype=np.int64),
+        "sum": np.zeros(n_fdv),
+        "min": np.full(n_fdv, np.inf),
+        "max": np.full(n_fdv, -np.inf),
+    }
+
+
+def sketch_chunk(points, avg_cost, goal, supply: float, fdvs, tokens=None) -> dict:
+    """Sketch of net profit and badges for one chunk of wallets at every FDV.
+
+    Size depends only on len(fdvs), never on the number of wallets, and
+    two sketches combine with merge_sketches. `tokens` defaults to one per
+    point.
+    """
+    fdvs = np.asarray(fdvs, dtype=float)
+    points = np.asarray(points, dtype=float)
+    tokens = points if tokens is None else np.asarray(tokens, dtype=float)
+    net = tokens[None, :] * (fdvs[:, None] / supply) - (points * avg_cost)[None, :]
+    n_fdv, n_vals = fdvs.size, SKETCH_VALUES.size
+    offsets = (np.arange(n_fdv) * n_vals)[:, None]
+
+    mag = np.floor(np.log(np.maximum(np.abs(net), 1.0)) / np.log(SKETCH_GAMMA))
+    mag = np.clip(mag, 0, SKETCH_BINS - 1).astype(np.int64)
+    bucket = np.where(net >= 1, SKETCH_BINS + 1 + mag, np.where(net <= -1, SKETCH_BINS - 1 - mag, SKETCH_BINS))
+    badge = badge_index(points[None, :], net, goal)
+
+    sketch = empty_sketch(n_fdv)
+    sketch["n"] = points.size
+    sketch["buckets"] = np.bincount((bucket + offsets).ravel(), minlength=n_fdv * n_vals).reshape(n_fdv, n_vals)
+    sketch["badges"] = np.bincount(
+        (badge + (np.arange(n_fdv) * len(BADGES))[:, None]).ravel(), minlength=n_fdv * len(BADGES)
+    ).reshape(n_fdv, len(BADGES))
+    if points.size:
+        sketch["sum"] = net.sum(axis=1)
+        sketch["min"] = net.min(axis=1)
+        sketch["max"] = net.max(axis=1)
+    return sketch
+
+
+def merge_sketches(a: dict, b: dict) -> dict:
+    return {
+        "n": a["n"] + b["n"],
+        "badges": a["badges"] + b["badges"],
+        "buckets": a["buckets"] + b["buckets"],
+        "sum": a["sum"] + b["sum"],
+        "min": np.minimum(a["min"], b["min"]),
+        "max": np.maximum(a["max"], b["max"]),
+    }
+
+
+def sketch_quantiles(sketch: dict, qs) -> np.ndarray:
+    """Approximate net-profit quantiles per FDV, shape (F, len(qs))."""
+    cum = np.cumsum(sketch["buckets"], axis=1)
+    ranks = np.asarray(qs, dtype=float) * max(sketch["n"] - 1, 0) + 1
+    idx = np.stack([np.searchsorted(row, ranks) for row in cum])
+    vals = SKETCH_VALUES[np.minimum(idx, SKETCH_VALUES.size - 1)]
+    return np.clip(vals, sketch["min"][:, None], sketch["max"][:, None])
+
+
+def sketch_histogram(sketch: dict, edges=DIST_EDGES) -> np.ndarray:
+    """Wallet counts per FDV between `edges` (open-ended at both ends)."""
+    bins = np.searchsorted(np.asarray(edges), SKETCH_VALUES, side="right")
+    return np.stack([np.bincount(bins, weights=row, minlength=len(edges) + 1) for row in sketch["buckets"]])
+
+
+def wallet_chunks(stream, default_cost: float, default_goal: float, rows: int = LEADERBOARD_CHUNK_ROWS):
+    """Yield (wallets, points, avg_cost, goal) arrays of up to `rows` wallets from a CSV stream.
+
+    Needs a `points` column; `avg_cost` (or `spent`) and `goal` fall back to
+    `default_cost` and `default_goal`.
+    """
+    reader = csv.DictReader(stream)
+    reader.fieldnames = [(name or "").strip().lower() for name in reader.fieldnames or []]
+    ids, pts, cost, goals = [], [], [], []
+    for i, row in enumerate(reader):
+        try:
+            p = float(row.get("points") or 0)
+            if row.get("avg_cost"):
+                c = float(row["avg_cost"])
+            elif row.get("spent") and p > 0:
+                c = float(row["spent"]) / p
+            else:
+                c = default_cost
+            g = float(row["goal"]) if row.get("goal") else default_goal
+        except ValueError:
+            continue
+        ids.append((row.get("wallet") or row.get("address") or f"#{i}").strip().lower())
+        pts.append(p)
+        cost.append(c)
+        goals.append(g)
+        if len(pts) >= rows:
+            yield np.array(ids), np.array(pts), np.array(cost), np.array(goals)
+            ids, pts, cost, goals = [], [], [], []
+    if pts:
+        yield np.array(ids), np.array(pts), np.array(cost), np.array(goals)
+
+
+@st.cache_data
+def leaderboard_columns(source) -> dict:
+    """Stream a wallet CSV (path + mtime, or raw bytes) once into per-wallet columns.
+
+    Wallet ids are kept as int64 hashes; avg_cost and goal are NaN where the
+    file leaves them out, so the values entered in the app fill them in later
+    without re-reading the file.
+    """
+    if isinstance(source, bytes):
+        stream = io.StringIO(source.decode("utf-8", errors="ignore"))
+    else:
+        stream = open(source[0], newline="", encoding="utf-8", errors="ignore")
+    ids, points, cost, goals = [], [], [], []
+    with stream:
+        for chunk_ids, chunk_points, chunk_cost, chunk_goals in wallet_chunks(stream, np.nan, np.nan):
+            ids.append(np.array([hash(w) for w in chunk_ids], dtype=np.int64))
+            points.append(chunk_points)
+            cost.append(chunk_cost)
+            goals.append(chunk_goals)
+    empty = np.zeros(0)
+    return {
+        "ids": np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64),
+        "points": np.concatenate(points) if points else empty,
+        "cost": np.concatenate(cost) if cost else empty,
+        "goal": np.concatenate(goals) if goals else empty,
+    }
+
+
+@st.cache_data
+def leaderboard_sketch(
+    source,
+    supply: float,
+    default_cost: float,
+    default_goal: float,
+    fdvs: tuple,
+    alloc: tuple = (),
+    excluded: frozenset = frozenset(),
+) -> dict:
+    """Merged sketch of the wallets in `source` at every FDV.
+
+    The file itself is read once by leaderboard_columns; changing the other
+    arguments only re-sketches the cached columns, LEADERBOARD_CHUNK_ROWS at
+    a time on a thread pool. Points turn into tokens through `alloc` (see
+    alloc_tokens), with `excluded` wallets getting none.
+    """
+    cols = leaderboard_columns(source)
+    excluded_ids = np.array([hash(w) for w in excluded], dtype=np.int64)
+
+    def sketch_rows(start: int) -> dict:
+        rows = slice(start, start + LEADERBOARD_CHUNK_ROWS)
+        points = cols["points"][rows]
+        cost = np.where(np.isnan(cols["cost"][rows]), default_cost, cols["cost"][rows])
+        goals = np.where(np.isnan(cols["goal"][rows]), default_goal, cols["goal"][rows])
+        tokens = np.where(np.isin(cols["ids"][rows], excluded_ids), 0.0, alloc_tokens(points, alloc))
+        return sketch_chunk(points, cost, goals, supply, fdvs, tokens)
+
+    total = empty_sketch(len(fdvs))
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        for part in pool.map(sketch_rows, range(0, cols["points"].size, LEADERBOARD_CHUNK_ROWS)):
+            total = merge_sketches(total, part)
+    return total
+
+
+def parse_tiers(text: str) -> tuple:
+    """'threshold:multiplier' pairs (comma separated) -> sorted ((threshold, mult), ...)."""
+    tiers = []
+    for pair in text.split(","):
+        try:
+            lo, mult = pair.split(":")
+            tiers.append((float(lo), float(mult)))
+        except ValueError:
+            continue
+    return tuple(sorted(tiers))
+
+
+def alloc_weight(points, tiers: tuple, min_points: float):
+    """Allocation weight of each wallet: points x tier multiplier, 0 below the sybil floor."""
+    points = np.asarray(points, dtype=float)
+    mult = np.ones(points.shape)
+    if tiers:
+        lows = np.array([lo for lo, _ in tiers])
+        mults = np.array([m for _, m in tiers])
+        idx = np.searchsorted(lows, points, side="right") - 1
+        mult = np.where(idx >= 0, mults[np.maximum(idx, 0)], 1.0)
+    return np.where((points >= min_points) & (points > 0), points * mult, 0.0)
+
+
+def load_snapshot(raw: bytes) -> tuple:
+    """(wallets, points) from a leaderboard CSV, one entry per wallet.
+
+    Rows repeating a wallet are summed; wallets fall back to row numbers.
+    """
+    totals = {}
+    reader = csv.DictReader(io.StringIO(raw.decode("utf-8", errors="ignore")))
+    reader.fieldnames = [(name or "").strip().lower() for name in reader.fieldnames or []]
+    for i, row in enumerate(reader):
+        try:
+            pts = float(row.get("points") or 0)
+        except ValueError:
+            continue
+        wallet = (row.get("wallet") or row.get("address") or f"#{i}").strip().lower()
+        totals[wallet] = totals.get(wallet, 0.0) + pts
+    return list(totals), np.array(list(totals.values()), dtype=float)
+
+
+def alloc_pool(wallets, points, tiers: tuple, min_points: float, excluded: frozenset) -> dict:
+    """Build the allocation pool once from a full snapshot.
+
+    Keeps each wallet's points and weight, the total weight and a sorted
+    list of weights so alloc_update can move one wallet in O(log n).
+    """
+    weights = alloc_weight(points, tiers, min_points)
+    weights = np.where([w in excluded for w in wallets], 0.0, weights)
+    return {
+        "tiers": tiers,
+        "min_points": min_points,
+        "excluded": excluded,
+        "points": dict(zip(wallets, points.tolist())),
+        "weights": dict(zip(wallets, weights.tolist())),
+        "total": float(weights.sum()),
+        "sorted": sorted(w for w in weights.tolist() if w > 0),
+    }
+
+
+def alloc_update(pool: dict, wallet: str, points: float) -> None:
+    """Set one wallet's points, adjusting totals instead of rebuilding the pool."""
+    if pool["points"].get(wallet) == points:
+        return
+    old = pool["weights"].get(wallet, 0.0)
+    new = 0.0 if wallet in pool["excluded"] else float(alloc_weight(points, pool["tiers"], pool["min_points"]))
+    if old > 0:
+        del pool["sorted"][bisect.bisect_left(pool["sorted"], old)]
+    if new > 0:
+        bisect.insort(pool["sorted"], new)
+    pool["points"][wallet] = points
+    pool["weights"][wallet] = new
+    pool["total"] += new - old
+
+
+def alloc_rate(pool: dict, airdrop_tokens: float, cap_tokens: float = 0.0) -> float:
+    """Tokens per unit of weight so that min(weight x rate, cap) sums to the airdrop.
+
+    Without a cap this is airdrop / total weight. With one, the largest
+    wallets are capped one by one (water-filling) and the rest share what
+    is left; only the capped wallets at the top of the sorted list are
+    visited.
+    """
+    ranked, total = pool["sorted"], pool["total"]
+    if total <= 0 or not ranked:
+        return 0.0
+    if cap_tokens <= 0:
+        return airdrop_tokens / total
+    if cap_tokens * len(ranked) <= airdrop_tokens:
+        return cap_tokens / ranked[0]
+    capped_weight = 0.0
+    for k in range(len(ranked)):
+        rate = (airdrop_tokens - k * cap_tokens) / (total - capped_weight)
+        if ranked[-1 - k] * rate <= cap_tokens:
+            return rate
+        capped_weight += ranked[-1 - k]
+    return cap_tokens / ranked[0]
+
+
+def alloc_tokens(points, alloc: tuple):
+    """Tokens per wallet for alloc = (rate, cap_tokens, tiers, min_points); points if alloc is empty."""
+    if not alloc:
+        return np.asarray(points, dtype=float)
+    rate, cap_tokens, tiers, min_points = alloc
+    tokens = alloc_weight(points, tiers, min_points) * rate
+    return np.minimum(tokens, cap_tokens) if cap_tokens > 0 else tokens
+
+
 def get_b64(path: str) -> str:
     if not os.path.exists(path):
         return ""
@@ -220,6 +757,11 @@ footer,
 .sc-table th:nth-child(1) {{ width: 30%; }}
 .sc-table th:nth-child(2) {{ width: 35%; }}
 .sc-table th:nth-child(3) {{ width: 35%; text-align: right; }}
+.sc-table.x4 th:nth-child(1) {{ width: 24%; }}
+.sc-table.x4 th:nth-child(2) {{ width: 20%; }}
+.sc-table.x4 th:nth-child(3) {{ width: 28%; text-align: right; }}
+.sc-table.x4 th:nth-child(4) {{ width: 28%; text-align: right; }}
+.sc-table.x4 td:nth-child(3) {{ text-align: right; }}
 .sc-table td {{
   font-size: 0.82rem;
   color: var(--t2);
@@ -300,7 +842,7 @@ div[data-testid="stSelectbox"] > div > div {{
 c1, c2 = st.columns(2)
 with c1:
     total_points = st.number_input(
-        "Your Points / Tokens",
+        "Your Points",
         min_value=0.0,
         value=170000.0,
         step=1000.0,
@@ -337,6 +879,94 @@ goal = st.number_input(
     step=5000.0,
 )
 
+with st.expander("Exit Liquidity — slippage on the way out", expanded=False):
+    exit_model = st.selectbox(
+        "Exit Model",
+        options=EXIT_MODELS,
+        index=EXIT_MODELS.index("Paper (no slippage)"),
+    )
+    e1, e2 = st.columns(2)
+    with e1:
+        pool_pct = st.number_input(
+            "Pool Depth (% of FDV)",
+            min_value=0.01,
+            value=1.0,
+            step=0.25,
+            disabled=exit_model != "AMM Pool",
+        )
+    with e2:
+        sell_chunks = st.number_input(
+            "Sell in N Chunks",
+            min_value=1,
+            value=1,
+            step=1,
+        )
+    book_file = None
+    if exit_model == "Order Book (CSV)":
+        book_file = st.file_uploader(
+            "Bid book CSV — discount_pct,depth_usd per level (e.g. 0.5,20000)",
+            type=["csv", "txt"],
+        )
+        if book_file is None or not load_book(book_file.getvalue())[0]:
+            st.info("Upload a bid book with at least one level — until then everything uses paper value.")
+
+with st.expander("Points → Tokens — airdrop allocation", expanded=False):
+    alloc_model = st.selectbox("Allocation Model", options=ALLOC_MODELS, index=0)
+    is_alloc = alloc_model != ALLOC_MODELS[0]
+    a1, a2 = st.columns(2)
+    with a1:
+        airdrop_pct = st.number_input(
+            "Airdrop Share (% of supply)",
+            min_value=0.01,
+            max_value=100.0,
+            value=10.0,
+            step=1.0,
+            disabled=not is_alloc,
+        )
+    with a2:
+        cap_pct = st.number_input(
+            "Cap per Wallet (% of airdrop, 0 = none)",
+            min_value=0.0,
+            max_value=100.0,
+            value=0.0,
+            step=0.05,
+            disabled=not is_alloc,
+        )
+    a3, a4 = st.columns(2)
+    with a3:
+        min_points = st.number_input(
+            "Sybil Floor (min points)",
+            min_value=0.0,
+            value=0.0,
+            step=100.0,
+            disabled=not is_alloc,
+        )
+    with a4:
+        my_wallet = st.text_input(
+            "Your Wallet (optional)",
+            value="",
+            disabled=not is_alloc,
+            help="On the leaderboard? Enter your address so the points above replace your snapshot entry.",
+        )
+    tiers_raw = st.text_input(
+        "Tiers — points:multiplier, from that many points up",
+        value=DEFAULT_TIERS,
+        disabled=alloc_model != "Tiered",
+    )
+    excluded_raw = st.text_area("Excluded wallets (sybils) — one per line", value="", disabled=not is_alloc)
+    snapshot_file = updates_file = None
+    if is_alloc:
+        snapshot_file = st.file_uploader(
+            "Leaderboard snapshot CSV — wallet,points (defaults to leaderboard.csv)",
+            type=["csv", "txt"],
+            key="snapshot_file",
+        )
+        updates_file = st.file_uploader(
+            "Point updates CSV — wallet,points rows applied on top of the snapshot",
+            type=["csv", "txt"],
+            key="updates_file",
+        )
+
 # comparable protocols
 comps_html = "".join(f'<span class="pill">{n} · {v}</span>' for n, v in COMPARABLE_PROTOCOLS)
 st.markdown(
@@ -348,34 +978,186 @@ st.markdown(
 st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
 
 # ── MATH ──
+total_tokens = total_points
+alloc = ()
+excluded = frozenset()
+me_excluded = False
+if is_alloc:
+    if snapshot_file is not None:
+        snapshot_id = hashlib.sha1(snapshot_file.getvalue()).hexdigest()
+    elif os.path.isfile(LEADERBOARD_PATH):
+        snapshot_id = (LEADERBOARD_PATH, os.path.getmtime(LEADERBOARD_PATH))
+    else:
+        snapshot_id = None
+
+    if snapshot_id is not None:
+        tiers = parse_tiers(tiers_raw) if alloc_model == "Tiered" else ()
+        excluded = frozenset(w.strip().lower() for w in excluded_raw.split() if w.strip())
+        pool_key = (snapshot_id, tiers, min_points, excluded)
+        if st.session_state.get("alloc_key") != pool_key:
+            if snapshot_file is not None:
+                snapshot_raw = snapshot_file.getvalue()
+            else:
+                with open(LEADERBOARD_PATH, "rb") as f:
+                    snapshot_raw = f.read()
+            wallets, points = load_snapshot(snapshot_raw)
+            st.session_state.alloc_pool = alloc_pool(wallets, points, tiers, min_points, excluded)
+            st.session_state.alloc_key = pool_key
+            st.session_state.alloc_updates = set()
+            st.session_state.alloc_me = None
+        pool = st.session_state.alloc_pool
+
+        # only wallets that changed are touched; the snapshot is never re-read
+        updates_id = hashlib.sha1(updates_file.getvalue()).hexdigest() if updates_file is not None else None
+        if updates_id is not None and updates_id not in st.session_state.alloc_updates:
+            for w, pts in zip(*load_snapshot(updates_file.getvalue())):
+                alloc_update(pool, w, float(pts))
+            st.session_state.alloc_updates.add(updates_id)
+
+        # without a wallet the user is priced against the pool as-is, so points
+        # already in the snapshot are never counted twice
+        me = my_wallet.strip().lower()
+        prev = st.session_state.alloc_me
+        if prev is not None and prev[0] != me:
+            alloc_update(pool, prev[0], prev[1])
+            st.session_state.alloc_me = prev = None
+        if me:
+            if prev is None:
+                st.session_state.alloc_me = (me, pool["points"].get(me, 0.0))
+            alloc_update(pool, me, total_points)
+
+        airdrop_tokens = total_supply * airdrop_pct / 100
+        cap_tokens = airdrop_tokens * cap_pct / 100
+        alloc = (alloc_rate(pool, airdrop_tokens, cap_tokens), cap_tokens, tiers, min_points)
+        me_excluded = me in excluded
+        total_tokens = 0.0 if me_excluded else float(alloc_tokens(total_points, alloc))
+    else:
+        st.warning(
+            f"{alloc_model} allocation needs a leaderboard snapshot — upload one under Points → Tokens "
+            "or add leaderboard.csv next to the app. Using 1 point = 1 token until then."
+        )
+tokens_per_point = total_tokens / total_points if total_points > 0 else 1.0
+
 token_price = target_fdv / total_supply
 total_spent = total_points * avg_cost
-gross_value = total_points * token_price
+gross_value = total_tokens * token_price
 net_profit = gross_value - total_spent
 roi = (net_profit / total_spent * 100) if total_spent > 0 else 0
 venture_x = target_fdv / BASELINE_FDV
 
-if total_points > 0:
-    required_fdv = ((goal + total_spent) / total_points) * total_supply
+book_levels = load_book(book_file.getvalue()) if book_file is not None else ((), ())
+exit_cfg = (exit_model, pool_pct, total_supply, book_levels)
+exit_once = make_exit(*exit_cfg)
+exit_value = chunked(exit_once, sell_chunks) if exit_once else None
+
+if exit_value:
+    realized_once = float(exit_once(total_tokens, token_price))
+    realized_value = float(exit_value(total_tokens, token_price))
 else:
-    required_fdv = float("inf")
+    realized_once = realized_value = gross_value
+real_profit = realized_value - total_spent
+
+preset_fdvs = list(FDV_PRESETS.values())
+# the solver works in points; tiers and caps make tokens nonlinear in points,
+# so an allocation model goes through value_fn
+if alloc:
+    sell_value = exit_value or linear_value
+    token_share = 0.0 if me_excluded else 1.0
+
+    def points_value(points, price):
+        return sell_value(alloc_tokens(points, alloc) * token_share, price)
+else:
+    points_value = exit_value
+
+needs = solve_needs(
+    total_points, avg_cost, total_supply, [goal * r for r in GOAL_LADDER], preset_fdvs,
+    value_fn=points_value,
+)
+fdv_idx = preset_fdvs.index(target_fdv)
+goal_idx = GOAL_LADDER.index(1.0)
+required_fdv = needs["required_fdv"][0, goal_idx]
 
 # ── BREAKDOWN ──
 pnl_class = "green" if net_profit >= 0 else "red"
 
+alloc_row = ""
+if alloc:
+    alloc_row = (
+        f'<div class="row"><span class="k">Tokens per Point ({alloc_model}, {airdrop_pct:g}% airdrop)</span>'
+        f'<span class="v warm">{tokens_per_point:,.4f}</span></div>'
+    )
+
 st.markdown(f"""
 <div class="card">
   <div class="card-title">Breakdown</div>
   <div class="row"><span class="k">Token Price (FDV / Supply)</span><span class="v warm">{fmt(token_price)}</span></div>
   <div class="row"><span class="k">You Spent ({total_points:,.0f} pts x {avg_cost:.4f})</span><span class="v">{fmt(total_spent)}</span></div>
-  <div class="row"><span class="k">Gross Value ({total_points:,.0f} pts x {token_price:.4f})</span><span class="v">{fmt(gross_value)}</span></div>
+  {alloc_row}
+  <div class="row"><span class="k">Gross Value ({total_tokens:,.0f} tokens x {token_price:.4f})</span><span class="v">{fmt(gross_value)}</span></div>
   <div class="row"><span class="k">Venture Multiplier (vs $80M seed)</span><span class="v">{venture_x:.1f}x</span></div>
 </div>
 """, unsafe_allow_html=True)
 
-# ── RESULT CARD (Net Profit + Stats + Verdict + Share) ──
+if exit_value:
+    exits = [("All at once", realized_once)]
+    if sell_chunks > 1:
+        exits.append((f"In {sell_chunks} chunks", realized_value))
+    exit_rows = ""
+    for label, value in exits:
+        eff_price = value / total_tokens if total_tokens > 0 else token_price
+        slip = (1 - value / gross_value) * 100 if gross_value > 0 else 0
+        exit_rows += (
+            f'<div class="row"><span class="k">Realized — {label} (eff. {eff_price:.4f}, -{slip:.1f}%)</span>'
+            f'<span class="v">{fmt(value)}</span></div>'
+        )
+    real_class = "green" if real_profit >= 0 else "red"
+    st.markdown(f"""
+<div class="card">
+  <div class="card-title">Realistic Exit — {exit_model}</div>
+  {exit_rows}
+  <div class="row"><span class="k">Realistic Net Profit</span><span class="v {real_class}">{fmt(real_profit)}</span></div>
+</div>
+""", unsafe_allow_html=True)
+
+# ── WHAT YOU NEED ──
 fdv_label = fdv_choice.split(chr(8212))[0].strip()
 
+need_rows = ""
+for r, fdv_r in zip(GOAL_LADDER, needs["required_fdv"][0]):
+    label = "Break-even FDV" if r == 0 else f"FDV for {fmt(goal * r)} profit"
+    need_rows += f'<div class="row"><span class="k">{label}</span><span class="v warm">{fmt_need(fdv_r)}</span></div>'
+
+need_rows += (
+    f'<div class="row"><span class="k">Max Avg Cost to Break Even at {fdv_label}</span>'
+    f'<span class="v">{fmt(needs["max_cost"][0, fdv_idx])}</span></div>'
+    f'<div class="row"><span class="k">Points for Goal at {fdv_label} (@ {avg_cost:.4f})</span>'
+    f'<span class="v">{fmt_pts(needs["min_points"][0, goal_idx, fdv_idx])}</span></div>'
+)
+
+preset_rows = ""
+for i, fdv_p in enumerate(preset_fdvs):
+    cls = ' class="active"' if fdv_p == target_fdv else ""
+    preset_rows += (
+        f"<tr{cls}>"
+        f"<td>{fmt(fdv_p)}</td>"
+        f"<td>{fmt(needs['max_cost'][0, i])}</td>"
+        f"<td>{fmt_pts(needs['min_points'][0, goal_idx, i])}</td>"
+        f"</tr>"
+    )
+
+st.markdown(f"""
+<div class="card">
+  <div class="card-title">What You Need — {exit_model if exit_value else "Paper value"}</div>
+  {need_rows}
+  <table class="sc-table">
+    <thead><tr><th>FDV</th><th>Max Cost / Pt</th><th>Pts for Goal</th></tr></thead>
+    <tbody>{preset_rows}</tbody>
+  </table>
+</div>
+""", unsafe_allow_html=True)
+
+# ── RESULT CARD (Net Profit + Stats + Verdict + Share) ──
+
 if net_profit >= goal and total_points > 0:
     emoji = "🎯"
 elif net_profit >= 0:
@@ -394,18 +1176,7 @@ tweet_url = f"https://twitter.com/intent/tweet?text={tweet_text}"
 
 roi_class = "green" if roi > 0 else "red"
 
-if total_points > 0 and net_profit >= goal:
-    badge_cls = "ok"
-    badge_txt = "GOAL HIT"
-elif total_points > 0 and net_profit >= 0:
-    badge_cls = "ok"
-    badge_txt = "PROFIT"
-elif total_points > 0:
-    badge_cls = "no"
-    badge_txt = "REKT"
-else:
-    badge_cls = "no"
-    badge_txt = "NO DATA"
+badge_cls, badge_txt = BADGES[int(badge_index(total_points, net_profit, goal))]
 
 logo_src = f"data:image/png;base64,{logo}" if logo else ""
 tweet_url_escaped = tweet_url.replace("'", "\\'")
@@ -632,31 +1403,268 @@ st.link_button(
 )
 
 # ── SCENARIO TABLE ──
-scenarios = [50000000, 200000000, 500000000, 1000000000, 2000000000, 5000000000, 10000000000]
-rows_html = ""
-for fdv_s in scenarios:
-    price_s = fdv_s / total_supply
-    net_s = (total_points * price_s) - total_spent
+with st.expander("Custom FDV Ladder", expanded=False):
+    ladder_source = st.selectbox("Ladder", options=LADDER_SOURCES, index=0)
+    l1, l2, l3 = st.columns(3)
+    is_range = ladder_source.startswith("Range")
+    with l1:
+        ladder_start = st.number_input(
+            "From FDV ($)",
+            min_value=1.0,
+            value=50000000.0,
+            step=10000000.0,
+            disabled=not is_range,
+        )
+    with l2:
+        ladder_stop = st.number_input(
+            "To FDV ($)",
+            min_value=1.0,
+            value=10000000000.0,
+            step=100000000.0,
+            disabled=not is_range,
+        )
+    with l3:
+        ladder_steps = st.number_input(
+            "Steps",
+            min_value=2,
+            max_value=MAX_LADDER_ROWS,
+            value=50,
+            step=10,
+            disabled=not is_range,
+        )
+    ladder_raw = ""
+    if ladder_source == "Imported list":
+        ladder_raw = st.text_area("FDVs — comma or newline separated (300M, 1.5B, 2,000,000,000)", value="")
+        ladder_file = st.file_uploader("...or a CSV / text file of FDVs", type=["csv", "txt"], key="ladder_file")
+        if ladder_file is not None:
+            ladder_raw += "\n" + ladder_file.getvalue().decode("utf-8", errors="ignore")
+
+scenarios, ladder_size = fdv_ladder(ladder_source, ladder_start, ladder_stop, int(ladder_steps), ladder_raw)
+if ladder_size > MAX_LADDER_ROWS:
+    st.warning(
+        f"The ladder has {ladder_size:,} distinct FDVs — only the lowest {MAX_LADDER_ROWS:,} are shown "
+        f"(up to {fmt(scenarios[-1])})."
+    )
+if not scenarios.size:
+    st.warning("No FDVs could be read from the imported list — showing the default ladder instead.")
+    scenarios = np.array(DEFAULT_SCENARIOS, dtype=float)
+prices_s = scenarios / total_supply
+paper_s = total_tokens * prices_s - total_spent
+real_s = (exit_value(total_tokens, prices_s) if exit_value else total_tokens * prices_s) - total_spent
+
+table_slot = st.empty()
+n_pages = max(1, -(-len(scenarios) // TABLE_PAGE_SIZE))
+page = 1
+if n_pages > 1:
+    page = st.number_input(
+        f"Page (of {n_pages:,})",
+        min_value=1,
+        max_value=n_pages,
+        value=1,
+        step=1,
+        key=f"page_{n_pages}",
+    )
+lo, hi = (page - 1) * TABLE_PAGE_SIZE, min(page * TABLE_PAGE_SIZE, len(scenarios))
+
+rows = []
+for fdv_s, price_s, net_s, real_net_s in zip(scenarios[lo:hi], prices_s[lo:hi], paper_s[lo:hi], real_s[lo:hi]):
     cls = ' class="active"' if fdv_s == target_fdv else ""
     color_cls = "green" if net_s >= 0 else "red"
-    rows_html += (
+    real_cls = "green" if real_net_s >= 0 else "red"
+    rows.append(
         f"<tr{cls}>"
         f"<td>{fmt(fdv_s)}</td>"
         f"<td>{fmt(price_s)}</td>"
         f'<td style="color: var(--{color_cls})">{fmt(net_s)}</td>'
+        f'<td style="color: var(--{real_cls})">{fmt(real_net_s)}</td>'
         f"</tr>"
     )
+rows_html = "".join(rows)
 
-st.markdown(f"""
+if len(scenarios) > TABLE_PAGE_SIZE:
+    span = f" — rows {lo + 1:,}–{hi:,} of {len(scenarios):,}"
+else:
+    span = ""
+
+table_slot.markdown(f"""
 <div class="card">
-  <div class="card-title">Your Profit Across FDV Scenarios</div>
-  <table class="sc-table">
-    <thead><tr><th>FDV</th><th>Token Price</th><th>Net Profit</th></tr></thead>
+  <div class="card-title">Your Profit Across FDV Scenarios{span}</div>
+  <table class="sc-table x4">
+    <thead><tr><th>FDV</th><th>Token Price</th><th>Paper Net</th><th>Realistic Net</th></tr></thead>
     <tbody>{rows_html}</tbody>
   </table>
 </div>
 """, unsafe_allow_html=True)
 
+# ── BACKTEST ──
+with st.expander("Backtest Exit Strategies on Comparable Tokens", expanded=False):
+    history_files = ()
+    if os.path.isdir(HISTORY_DIR):
+        history_files = tuple(
+            (os.path.join(HISTORY_DIR, name), os.path.getmtime(os.path.join(HISTORY_DIR, name)))
+            for name in sorted(os.listdir(HISTORY_DIR))
+            if name.lower().endswith((".csv", ".txt"))
+        )
+    histories = dict(local_histories(history_files))
+    for up in st.file_uploader(
+        "Extra price histories — one CSV per token, daily prices oldest first",
+        type=["csv", "txt"],
+        accept_multiple_files=True,
+        key="history_files",
+    ) or []:
+        series = load_history(up.getvalue())
+        if series.size >= 2:
+            histories[os.path.splitext(up.name)[0]] = series
+
+    bt1, bt2 = st.columns(2)
+    with bt1:
+        weekly_pcts = st.multiselect(
+            "Weekly sell %",
+            options=[5, 10, 20, 25, 33, 50],
+            default=list(BACKTEST_WEEKLY_PCTS),
+        )
+    with bt2:
+        stop_pcts = st.multiselect(
+            "Trailing stop %",
+            options=[5, 10, 15, 20, 30, 40, 50],
+            default=list(BACKTEST_STOP_PCTS),
+        )
+    horizon = st.number_input(
+        "Horizon (days after TGE)",
+        min_value=7,
+        max_value=3650,
+        value=180,
+        step=30,
+    )
+
+    if histories and total_tokens > 0:
+        strategies = backtest_strategies(sorted(weekly_pcts), sorted(stop_pcts))
+        proceeds = run_backtest(histories, token_price, int(horizon), strategies, total_tokens, exit_cfg)
+        nets = proceeds - total_spent
+        order = np.argsort(-np.median(nets, axis=0))
+        bt_rows = []
+        for s_idx in order:
+            med = float(np.median(nets[:, s_idx]))
+            win = float((nets[:, s_idx] >= 0).mean() * 100)
+            med_cls = "green" if med >= 0 else "red"
+            bt_rows.append(
+                f"<tr>"
+                f"<td>{strategies[s_idx][0]}</td>"
+                f"<td>{fmt(nets[:, s_idx].min())} / {fmt(nets[:, s_idx].max())}</td>"
+                f'<td style="color: var(--{med_cls})">{fmt(med)}</td>'
+                f"<td>{win:.0f}%</td>"
+                f"</tr>"
+            )
+        st.markdown(f"""
+<div class="card" style="margin-top: 0.8rem;">
+  <div class="card-title">Net Profit over {len(histories)} Histories — listed at {fdv_label}</div>
+  <table class="sc-table x4">
+    <thead><tr><th style="width:34%">Strategy</th><th style="width:30%">Worst / Best</th><th style="width:20%">Median</th><th style="width:16%">Profitable</th></tr></thead>
+    <tbody>{"".join(bt_rows)}</tbody>
+  </table>
+</div>
+""", unsafe_allow_html=True)
+        st.caption("Histories: " + ", ".join(histories))
+    else:
+        st.markdown("""
+<p style="color: #5a5a5a; font-size: 0.82rem; text-align:center; margin-top:0.5rem;">
+  Drop price CSVs into <code>histories/</code> or upload them above to run the backtest.
+</p>
+""", unsafe_allow_html=True)
+
+# ── LEADERBOARD ANALYTICS ──
+with st.expander("Leaderboard Analytics — how does everyone else do?", expanded=False):
+    lb_upload = st.file_uploader(
+        "Wallet CSV (defaults to leaderboard.csv) — needs a points column; avg_cost / spent and goal are optional",
+        type=["csv", "txt"],
+        key="leaderboard_file",
+    )
+    if lb_upload is not None:
+        lb_source = lb_upload.getvalue()
+    elif os.path.isfile(LEADERBOARD_PATH):
+        lb_source = (LEADERBOARD_PATH, os.path.getmtime(LEADERBOARD_PATH))
+    else:
+        lb_source = None
+
+    run_lb = st.toggle(
+        "Run leaderboard analytics",
+        value=False,
+        disabled=lb_source is None,
+        help="Reads the whole wallet file once, then re-sketches it as your inputs change.",
+    )
+
+    sketch = None
+    if lb_source is not None and run_lb:
+        sketch = leaderboard_sketch(
+            lb_source, total_supply, avg_cost, goal, tuple(preset_fdvs), alloc, excluded
+        )
+    if sketch and sketch["n"]:
+        lb_n = sketch["n"]
+        lb_q = sketch_quantiles(sketch, (0.1, 0.5, 0.9))
+
+        lb_rows = []
+        for i, fdv_p in enumerate(preset_fdvs):
+            cls = ' class="active"' if fdv_p == target_fdv else ""
+            med_cls = "green" if lb_q[i, 1] >= 0 else "red"
+            lb_rows.append(
+                f"<tr{cls}>"
+                f"<td>{fmt(fdv_p)}</td>"
+                f"<td>{sketch['badges'][i, 2] / lb_n * 100:.1f}%</td>"
+                f'<td style="color: var(--{med_cls})">{fmt(lb_q[i, 1])}</td>'
+                f"<td>{sketch['badges'][i, 0] / lb_n * 100:.1f}%</td>"
+                f"</tr>"
+            )
+
+        badge_rows = "".join(
+            f'<div class="row"><span class="k">{txt}</span>'
+            f'<span class="v {"green" if cls == "ok" else "red"}">'
+            f'{sketch["badges"][fdv_idx, k]:,} ({sketch["badges"][fdv_idx, k] / lb_n * 100:.1f}%)</span></div>'
+            for k, (cls, txt) in enumerate(BADGES)
+        )
+
+        hist = sketch_histogram(sketch)[fdv_idx]
+        edge_lbl = [fmt_card(e) for e in DIST_EDGES]
+        bin_lbl = (
+            [f"&lt; {edge_lbl[0]}"]
+            + [f"{a} … {b}" for a, b in zip(edge_lbl, edge_lbl[1:])]
+            + [f"&gt; {edge_lbl[-1]}"]
+        )
+        peak = max(hist.max(), 1)
+        zero_bin = DIST_EDGES.index(0)
+        dist_rows = "".join(
+            f'<div class="row"><span class="k" style="width:38%">{lbl}</span>'
+            f'<span style="flex:1; height:8px; margin:0 0.6rem; border-radius:4px; '
+            f'background:linear-gradient(90deg, var(--{"red" if j <= zero_bin else "green"}) '
+            f'{c / peak * 100:.1f}%, rgba(255,255,255,0.03) {c / peak * 100:.1f}%)"></span>'
+            f'<span class="v">{c / lb_n * 100:.1f}%</span></div>'
+            for j, (lbl, c) in enumerate(zip(bin_lbl, hist))
+        )
+
+        st.markdown(f"""
+<div class="card" style="margin-top: 0.8rem;">
+  <div class="card-title">{lb_n:,} Wallets at {fdv_label}</div>
+  {badge_rows}
+  <div class="row"><span class="k">Net Profit p10 / Median / p90</span><span class="v">{fmt(lb_q[fdv_idx, 0])} / {fmt(lb_q[fdv_idx, 1])} / {fmt(lb_q[fdv_idx, 2])}</span></div>
+</div>
+<div class="card">
+  <div class="card-title">Net Profit Distribution at {fdv_label}</div>
+  {dist_rows}
+</div>
+<div class="card">
+  <div class="card-title">Leaderboard Across FDV Presets</div>
+  <table class="sc-table x4">
+    <thead><tr><th>FDV</th><th>Rekt</th><th>Median Net</th><th>Goal Hit</th></tr></thead>
+    <tbody>{"".join(lb_rows)}</tbody>
+  </table>
+</div>
+""", unsafe_allow_html=True)
+    else:
+        st.markdown("""
+<p style="color: #5a5a5a; font-size: 0.82rem; text-align:center; margin-top:0.5rem;">
+  Upload a leaderboard CSV and switch on the analytics to see how every wallet fares at each FDV.
+</p>
+""", unsafe_allow_html=True)
+
 st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
 
 # ── COMPARISON MODE ──
@@ -0,0 +1,114 @@
+import sys
+from contextlib import contextmanager
+from functools import partial
+
+import numpy as np
+
+# Pure numpy exit and backtest kernels. They live outside app.py so worker
+# processes can import them; Streamlit runs app.py as __main__.
+
+EXIT_MODELS = ["AMM Pool", "Order Book (CSV)", "Paper (no slippage)"]
+
+
+def linear_value(points, price):
+    """Paper value: every point sells at the FDV-implied price."""
+    return points * price
+
+
+def amm_value(points, price, reserve_tokens: float):
+    """Constant-product exit against a pool holding `reserve_tokens` at `price`.
+
+    Proceeds are price * q * R / (R + q); with the pool sized as a share of
+    FDV, R is that share of total supply whatever the price.
+    """
+    points = np.asarray(points, dtype=float)
+    return points * price * reserve_tokens / (reserve_tokens + points)
+
+
+def book_value(points, price, discounts, depths_usd):
+    """Walk a bid book given as (discount below mid, $ depth at mid) levels.
+
+    Levels are filled best first; whatever is left after the book sells at
+    the last level's price, so the deepest level acts as a floor.
+    """
+    q = np.asarray(points, dtype=float)[..., None]
+    p = np.asarray(price, dtype=float)[..., None]
+    discounts = np.asarray(discounts, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cap = np.asarray(depths_usd, dtype=float) / p
+        start = np.cumsum(cap, axis=-1) - cap
+        filled = np.clip(q - start, 0, cap)
+        filled[..., -1] = np.maximum(q[..., 0] - start[..., -1], 0)
+        proceeds = (filled * p * (1 - discounts)).sum(axis=-1)
+    return np.nan_to_num(proceeds)
+
+
+def chunked(value_fn, chunks: int):
+    """Sell in equal chunks, letting liquidity refill between them."""
+    if chunks <= 1:
+        return value_fn
+    return lambda points, price: chunks * value_fn(np.asarray(points, dtype=float) / chunks, price)
+
+
+def make_exit(model: str, pool_pct: float, supply: float, book_levels: tuple):
+    """Single-sale value_fn for the chosen exit model, or None for paper value."""
+    if model == "AMM Pool":
+        return partial(amm_value, reserve_tokens=pool_pct / 100 * supply)
+    if model == "Order Book (CSV)" and book_levels[0]:
+        return partial(book_value, discounts=book_levels[0], depths_usd=book_levels[1])
+    return None
+
+
+def sell_schedule(path: np.ndarray, kind: str, param: float) -> np.ndarray:
+    """Share of the starting bag sold at each step of `path`; sums to 1.
+
+    Whatever a strategy has not sold by the end of the horizon is sold on
+    the last step.
+    """
+    sold = np.zeros(path.size)
+    if kind == "dump":
+        sold[0] = 1.0
+    elif kind == "weekly":
+        weeks = np.arange(0, path.size, 7)
+        sold[weeks] = np.diff(np.minimum(param * np.arange(1, weeks.size + 1), 1.0), prepend=0.0)
+    elif kind == "trail":
+        hit = np.flatnonzero(path <= np.maximum.accumulate(path) * (1 - param))
+        sold[hit[0] if hit.size else -1] = 1.0
+    sold[-1] += 1.0 - sold.sum()
+    return sold
+
+
+def replay_history(
+    series: np.ndarray,
+    listing_price: float,
+    horizon: int,
+    strategies: tuple,
+    points: float,
+    exit_cfg: tuple,
+) -> np.ndarray:
+    """Proceeds of every strategy over one price history, shape (S,).
+
+    The history is rescaled so day 0 trades at `listing_price`, then cut
+    or edge-padded to `horizon` days.
+    """
+    exit_once = make_exit(*exit_cfg) or linear_value
+    path = series[:horizon] / series[0] * listing_price
+    path = np.pad(path, (0, horizon - path.size), mode="edge")
+    sold = np.stack([sell_schedule(path, kind, param) for _, kind, param in strategies])
+    return exit_once(sold * points, path[None, :]).sum(axis=1)
+
+
+@contextmanager
+def worker_main():
+    """Let spawned workers import this module as __main__.
+
+    Streamlit registers the running script as __main__, and spawn re-imports
+    __main__ in every worker, which would run the whole app there. Wrap the
+    calls that start workers (submit / map) in this.
+    """
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = sys.modules[__name__]
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main